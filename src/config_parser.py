@@ -1,11 +1,26 @@
 import json
 import base64
-import re
 import logging
 from typing import Dict, Optional
-from urllib.parse import urlparse, parse_qs, unquote
+from urllib.parse import urlparse, parse_qs, unquote, unquote_plus
 import binascii
-from functools import lru_cache
+import copy
+from functools import lru_cache, wraps
+
+try:
+    from ada_url import URL as _AdaURL
+except ImportError:
+    _AdaURL = None
+
+try:
+    from pybase64 import b64decode as _b64decode
+except ImportError:
+    _b64decode = base64.b64decode
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
@@ -22,14 +37,15 @@ VALID_VLESS_FLOWS = {'', 'xtls-rprx-origin', 'xtls-rprx-direct', 'xtls-rprx-visi
 VALID_VLESS_SECURITY = {'none', 'tls', 'reality', 'xtls'}
 VALID_TRANSPORT_TYPES = {'tcp', 'kcp', 'ws', 'http', 'h2', 'quic', 'grpc', 'httpupgrade', 'splithttp', 'xhttp', 'raw'}
 
+_B64_DELETE = str.maketrans('', '', 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/-_')
+
 def is_base64(s: str) -> bool:
     if not s or len(s) < 4:
         return False
-    try:
-        s = s.rstrip('=')
-        return bool(re.match(r'^[A-Za-z0-9+/\-_]+$', s)) and len(s) % 4 in (0, 2, 3)
-    except Exception:
+    s = s.rstrip('=')
+    if not s or s.translate(_B64_DELETE):
         return False
+    return len(s) % 4 in (0, 2, 3)
 
 @lru_cache(maxsize=2048)
 def safe_b64decode(s: str) -> Optional[str]:
@@ -38,18 +54,75 @@ def safe_b64decode(s: str) -> Optional[str]:
     try:
         s = s.replace('-', '+').replace('_', '/')
         padding = '=' * (-len(s) % 4)
-        decoded = base64.b64decode(s + padding, validate=True)
+        decoded = _b64decode(s + padding, validate=True)
         return decoded.decode('utf-8', errors='strict')
     except (binascii.Error, UnicodeDecodeError, ValueError):
         pass
     
     try:
         s_original = s.replace('-', '+').replace('_', '/')
-        decoded = base64.b64decode(s_original)
+        decoded = _b64decode(s_original)
         return decoded.decode('utf-8', errors='ignore')
     except Exception:
         return None
 
+def _unquote_fast(s: str) -> str:
+    return unquote(s) if '%' in s else s
+
+def _parse_query(query: str) -> Dict[str, str]:
+    params = {}
+    if not query:
+        return params
+
+    for pair in query.split('&'):
+        key, sep, value = pair.partition('=')
+        if not sep or not value:
+            continue
+        if '%' in key or '+' in key:
+            key = unquote_plus(key)
+        if key in params:
+            continue
+        if '%' in value or '+' in value:
+            value = unquote_plus(value)
+        params[key] = value
+
+    return params
+
+def _cached_parser(func):
+    cached = lru_cache(maxsize=4096)(func)
+
+    @wraps(func)
+    def wrapper(config: str) -> Optional[Dict]:
+        result = cached(config)
+        return copy.copy(result) if result is not None else None
+
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+def _split_url(config: str):
+    if _AdaURL is not None:
+        try:
+            url = _AdaURL(config)
+            port = int(url.port) if url.port else None
+            username = url.username
+            hostname = url.hostname.strip('[]').lower()
+            # ada re-serializes userinfo and non-ASCII hosts with percent-
+            # encoding that the urlparse branch returns raw, and accepts some
+            # inputs urlparse rejects. Only trust its components when they
+            # appear verbatim in the input; otherwise fall through to urlparse
+            # so both branches return identical tuples.
+            if (username + '@') in config and hostname in config.lower():
+                return username, hostname, port, url.search.lstrip('?'), url.hash.lstrip('#')
+        except ValueError:
+            pass
+
+    try:
+        url = urlparse(config)
+        return url.username, url.hostname, url.port, url.query, url.fragment
+    except Exception:
+        return None
+
+@_cached_parser
 def decode_vmess(config: str) -> Optional[Dict]:
     if not config or not isinstance(config, str) or not config.startswith('vmess://'):
         return None
@@ -57,16 +130,21 @@ def decode_vmess(config: str) -> Optional[Dict]:
     encoded = config[8:].strip()
     if not encoded:
         return None
-    
-    decoded = safe_b64decode(encoded)
-    if not decoded:
-        return None
-    
+
     try:
-        data = json.loads(decoded)
-    except json.JSONDecodeError:
-        return None
-    
+        padded = encoded.replace('-', '+').replace('_', '/')
+        raw = _b64decode(padded + '=' * (-len(padded) % 4), validate=True)
+        data = _json_loads(raw)
+    except (binascii.Error, ValueError):
+        decoded = safe_b64decode(encoded)
+        if not decoded:
+            return None
+
+        try:
+            data = json.loads(decoded)
+        except json.JSONDecodeError:
+            return None
+
     if not isinstance(data, dict):
         return None
     
@@ -88,83 +166,85 @@ def decode_vmess(config: str) -> Optional[Dict]:
     
     return data
 
+@_cached_parser
 def parse_vless(config: str) -> Optional[Dict]:
     if not config or not isinstance(config, str) or not config.startswith('vless://'):
         return None
-    
-    try:
-        url = urlparse(config)
-    except Exception:
+
+    parts = _split_url(config)
+    if not parts:
         return None
-    
-    if not url.hostname or not url.username:
+
+    username, hostname, port, query, fragment = parts
+    if not hostname or not username:
         return None
-    
-    port = url.port or 443
-    
-    params = parse_qs(url.query)
-    security = params.get('security', ['none'])[0].lower()
+
+    port = port or 443
+
+    params = _parse_query(query)
+    security = params.get('security', 'none').lower()
     if security not in VALID_VLESS_SECURITY:
         security = 'none'
     
-    flow = params.get('flow', [''])[0].lower()
+    flow = params.get('flow', '').lower()
     if flow and flow not in VALID_VLESS_FLOWS:
         flow = ''
     
-    transport_type = params.get('type', ['tcp'])[0].lower()
+    transport_type = params.get('type', 'tcp').lower()
     if transport_type not in VALID_TRANSPORT_TYPES:
         transport_type = 'tcp'
     
     return {
-        'uuid': url.username,
-        'address': url.hostname,
+        'uuid': username,
+        'address': hostname,
         'port': port,
         'flow': flow,
-        'sni': params.get('sni', [url.hostname])[0],
+        'sni': params.get('sni', hostname),
         'type': transport_type,
-        'path': params.get('path', [''])[0],
-        'host': params.get('host', [url.hostname])[0],
+        'path': params.get('path', ''),
+        'host': params.get('host', hostname),
         'security': security,
-        'alpn': params.get('alpn', [''])[0],
-        'fp': params.get('fp', [''])[0],
-        'pbk': params.get('pbk', [''])[0],
-        'sid': params.get('sid', [''])[0],
-        'spx': params.get('spx', [''])[0],
-        'name': unquote(url.fragment) if url.fragment else ''
+        'alpn': params.get('alpn', ''),
+        'fp': params.get('fp', ''),
+        'pbk': params.get('pbk', ''),
+        'sid': params.get('sid', ''),
+        'spx': params.get('spx', ''),
+        'name': _unquote_fast(fragment) if fragment else ''
     }
 
+@_cached_parser
 def parse_trojan(config: str) -> Optional[Dict]:
     if not config or not isinstance(config, str) or not config.startswith('trojan://'):
         return None
-    
-    try:
-        url = urlparse(config)
-    except Exception:
+
+    parts = _split_url(config)
+    if not parts:
         return None
-    
-    if not url.hostname or not url.username:
+
+    username, hostname, port, query, fragment = parts
+    if not hostname or not username:
         return None
-    
-    port = url.port or 443
-    
-    params = parse_qs(url.query)
-    transport_type = params.get('type', ['tcp'])[0].lower()
+
+    port = port or 443
+
+    params = _parse_query(query)
+    transport_type = params.get('type', 'tcp').lower()
     if transport_type not in VALID_TRANSPORT_TYPES:
         transport_type = 'tcp'
-    
+
     return {
-        'password': url.username,
-        'address': url.hostname,
+        'password': username,
+        'address': hostname,
         'port': port,
-        'sni': params.get('sni', [url.hostname])[0],
-        'alpn': params.get('alpn', [''])[0],
+        'sni': params.get('sni', hostname),
+        'alpn': params.get('alpn', ''),
         'type': transport_type,
-        'path': params.get('path', [''])[0],
-        'host': params.get('host', [url.hostname])[0],
-        'security': params.get('security', ['tls'])[0],
-        'fp': params.get('fp', [''])[0],
-        'flow': params.get('flow', [''])[0],
-        'name': unquote(url.fragment) if url.fragment else ''
+        'path': params.get('path', ''),
+        'host': params.get('host', hostname),
+        'security': params.get('security', 'tls'),
+        'fp': params.get('fp', ''),
+        'flow': params.get('flow', ''),
+        'name': _unquote_fast(fragment) if fragment else ''
     }
 
 def parse_hysteria2(config: str) -> Optional[Dict]:
@@ -198,6 +278,7 @@ def parse_hysteria2(config: str) -> Optional[Dict]:
         'name': unquote(url.fragment) if url.fragment else ''
     }
 
+@_cached_parser
 def parse_shadowsocks(config: str) -> Optional[Dict]:
     if not config or not isinstance(config, str) or not config.startswith('ss://'):
         return None
@@ -227,7 +308,7 @@ def parse_shadowsocks(config: str) -> Optional[Dict]:
             except ValueError:
                 return None
             
-            credential_decoded = unquote(credential_part)
+            credential_decoded = _unquote_fast(credential_part)
             
             if is_base64(credential_decoded):
                 method_pass = safe_b64decode(credential_decoded)
@@ -277,7 +358,7 @@ def parse_shadowsocks(config: str) -> Optional[Dict]:
             'address': host,
             'port': port,
             'plugin': '',
-            'name': unquote(fragment) if fragment else ''
+            'name': _unquote_fast(fragment) if fragment else ''
         }
     
     except Exception as e:
@@ -74,50 +74,62 @@ def build_singbox_settings(data: Dict) -> Tuple[Dict, Dict]:
     
     return transport, tls
 
+def _xray_ws_settings(data: Dict, address: str) -> Dict:
+    return {
+        "path": data.get('path', '/'),
+        "headers": {"Host": data.get('host', address)}
+    }
+
+def _xray_grpc_settings(data: Dict, address: str) -> Dict:
+    return {
+        "serviceName": data.get('path', data.get('serviceName', ''))
+    }
+
+def _xray_http_settings(data: Dict, address: str) -> Dict:
+    return {
+        "host": [data.get('host', address)],
+        "path": data.get('path', '/')
+    }
+
+def _xray_quic_settings(data: Dict, address: str) -> Dict:
+    return {"security": "none", "header": {"type": "none"}}
+
+def _xray_kcp_settings(data: Dict, address: str) -> Dict:
+    return {"header": {"type": "none"}}
+
+def _xray_path_host_settings(data: Dict, address: str) -> Dict:
+    return {
+        "path": data.get('path', '/'),
+        "host": data.get('host', address)
+    }
+
+_XRAY_TRANSPORT_BUILDERS = {
+    'ws': ('wsSettings', _xray_ws_settings),
+    'grpc': ('grpcSettings', _xray_grpc_settings),
+    'http': ('httpSettings', _xray_http_settings),
+    'h2': ('httpSettings', _xray_http_settings),
+    'quic': ('quicSettings', _xray_quic_settings),
+    'kcp': ('kcpSettings', _xray_kcp_settings),
+    'httpupgrade': ('httpupgradeSettings', _xray_path_host_settings),
+    'splithttp': ('splithttpSettings', _xray_path_host_settings),
+    'xhttp': ('xhttpSettings', _xray_path_host_settings)
+}
+
 def build_xray_settings(data: Dict) -> Dict:
     stream_settings = {"network": "tcp", "security": "none"}
-    
+
     net_type = data.get('net', data.get('type', 'tcp')).lower()
     security = data.get('security', data.get('tls', 'none')).lower()
     address = data.get('address', data.get('add', ''))
-    
+
     try:
         stream_settings["network"] = net_type
-        
-        if net_type == 'ws':
-            stream_settings["wsSettings"] = {
-                "path": data.get('path', '/'),
-                "headers": {"Host": data.get('host', address)}
-            }
-        elif net_type == 'grpc':
-            stream_settings["grpcSettings"] = {
-                "serviceName": data.get('path', data.get('serviceName', ''))
-            }
-        elif net_type in ('http', 'h2'):
-            stream_settings["httpSettings"] = {
-                "host": [data.get('host', address)],
-                "path": data.get('path', '/')
-            }
-        elif net_type == 'quic':
-            stream_settings["quicSettings"] = {"security": "none", "header": {"type": "none"}}
-        elif net_type == 'kcp':
-            stream_settings["kcpSettings"] = {"header": {"type": "none"}}
-        elif net_type == 'httpupgrade':
-            stream_settings["httpupgradeSettings"] = {
-                "path": data.get('path', '/'),
-                "host": data.get('host', address)
-            }
-        elif net_type == 'splithttp':
-            stream_settings["splithttpSettings"] = {
-                "path": data.get('path', '/'),
-                "host": data.get('host', address)
-            }
-        elif net_type == 'xhttp':
-            stream_settings["xhttpSettings"] = {
-                "path": data.get('path', '/'),
-                "host": data.get('host', address)
-            }
-        
+
+        entry = _XRAY_TRANSPORT_BUILDERS.get(net_type)
+        if entry:
+            settings_key, builder = entry
+            stream_settings[settings_key] = builder(data, address)
+
         if security == 'reality':
             stream_settings["security"] = "reality"
             stream_settings["realitySettings"] = {
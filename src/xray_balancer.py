@@ -6,244 +6,345 @@ import logging
 import re
 from typing import Dict, Optional, List
 from urllib.parse import urlparse, parse_qs, unquote
+from concurrent.futures import ProcessPoolExecutor
 import config_parser as parser
 import transport_builder
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class ConfigToXray:
-    def __init__(self, input_file: str, output_file: str):
-        self.input_file = input_file
-        self.output_file = output_file
-        self.outbounds = []
+_loads = json.loads if orjson is None else orjson.loads
 
-    @staticmethod
-    def get_xray_template() -> Dict:
-        return {
-            "log": {
-                "loglevel": "warning"
+_PARALLEL_MIN_LINES = 500
+_PARALLEL_CHUNKSIZE = 128
+
+_XRAY_TEMPLATE_JSON = json.dumps({
+    "log": {
+        "loglevel": "warning"
+    },
+    "version": {"min": "26.2.6"},
+    "remarks": "👽 Anonymous Multi Balanced",
+    "dns": {
+        "servers": [
+            "https://dns.google/dns-query",
+            "https://cloudflare-dns.com/dns-query",
+            {
+                "address": "1.1.1.2",
+                "domains": [
+                    "domain:ir",
+                    "geosite:category-ir"
+                ],
+                "skipFallback": True,
+                "tag": "domestic-dns"
+            }
+        ]
+    },
+    "fakedns": [
+        {
+            "ipPool": "198.18.0.0/15",
+            "poolSize": 10000
+        }
+    ],
+    "inbounds": [
+        {
+            "port": 10808,
+            "protocol": "socks",
+            "settings": {
+                "auth": "noauth",
+                "udp": True,
+                "userLevel": 8
             },
-            "version": {"min": "26.2.6"},
-            "remarks": "👽 Anonymous Multi Balanced",
-            "dns": {
-                "servers": [
-                    "https://dns.google/dns-query",
-                    "https://cloudflare-dns.com/dns-query",
-                    {
-                        "address": "1.1.1.2",
-                        "domains": [
-                            "domain:ir",
-                            "geosite:category-ir"
-                        ],
-                        "skipFallback": True,
-                        "tag": "domestic-dns"
-                    }
-                ]
+            "sniffing": {
+                "destOverride": [
+                    "http",
+                    "tls",
+                    "fakedns"
+                ],
+                "enabled": True,
+                "routeOnly": False
             },
-            "fakedns": [
-                {
-                    "ipPool": "198.18.0.0/15",
-                    "poolSize": 10000
-                }
-            ],
-            "inbounds": [
-                {
-                    "port": 10808,
-                    "protocol": "socks",
-                    "settings": {
-                        "auth": "noauth",
-                        "udp": True,
-                        "userLevel": 8
-                    },
-                    "sniffing": {
-                        "destOverride": [
-                            "http",
-                            "tls",
-                            "fakedns"
-                        ],
-                        "enabled": True,
-                        "routeOnly": False
-                    },
-                    "tag": "socks"
-                }
-            ],
-            "observatory": {
-                "enableConcurrency": True,
-                "probeInterval": "3m",
-                "probeUrl": "https://www.gstatic.com/generate_204",
-                "subjectSelector": [
+            "tag": "socks"
+        }
+    ],
+    "observatory": {
+        "enableConcurrency": True,
+        "probeInterval": "3m",
+        "probeUrl": "https://www.gstatic.com/generate_204",
+        "subjectSelector": [
+            "proxy-"
+        ]
+    },
+    "outbounds": [],
+    "policy": {
+        "levels": {
+            "8": {
+                "connIdle": 300,
+                "downlinkOnly": 1,
+                "handshake": 4,
+                "uplinkOnly": 1
+            }
+        },
+        "system": {
+            "statsOutboundUplink": True,
+            "statsOutboundDownlink": True
+        }
+    },
+    "routing": {
+        "balancers": [
+            {
+                "selector": [
                     "proxy-"
-                ]
-            },
-            "outbounds": [],
-            "policy": {
-                "levels": {
-                    "8": {
-                        "connIdle": 300,
-                        "downlinkOnly": 1,
-                        "handshake": 4,
-                        "uplinkOnly": 1
-                    }
+                ],
+                "strategy": {
+                    "type": "leastPing"
                 },
-                "system": {
-                    "statsOutboundUplink": True,
-                    "statsOutboundDownlink": True
-                }
+                "tag": "proxy-round"
+            }
+        ],
+        "domainStrategy": "AsIs",
+        "rules": [
+            {
+                "inboundTag": [
+                    "socks"
+                ],
+                "outboundTag": "dns-out",
+                "port": "53",
+                "type": "field"
             },
-            "routing": {
-                "balancers": [
-                    {
-                        "selector": [
-                            "proxy-"
-                        ],
-                        "strategy": {
-                            "type": "leastPing"
-                        },
-                        "tag": "proxy-round"
-                    }
+            {
+                "ip": [
+                    "geoip:private"
                 ],
-                "domainStrategy": "AsIs",
-                "rules": [
-                    {
-                        "inboundTag": [
-                            "socks"
-                        ],
-                        "outboundTag": "dns-out",
-                        "port": "53",
-                        "type": "field"
-                    },
-                    {
-                        "ip": [
-                            "geoip:private"
-                        ],
-                        "outboundTag": "direct",
-                        "type": "field"
-                    },
-                    {
-                        "domain": [
-                            "geosite:private"
-                        ],
-                        "outboundTag": "direct",
-                        "type": "field"
-                    },
-                    {
-                        "domain": [
-                            "domain:ir",
-                            "geosite:category-ir"
-                        ],
-                        "outboundTag": "direct",
-                        "type": "field"
-                    },
-                    {
-                        "ip": [
-                            "geoip:ir"
-                        ],
-                        "outboundTag": "direct",
-                        "type": "field"
-                    },
-                    {
-                        "inboundTag": [
-                            "domestic-dns"
-                        ],
-                        "outboundTag": "direct",
-                        "type": "field"
-                    },
+                "outboundTag": "direct",
+                "type": "field"
+            },
+            {
+                "domain": [
+                    "geosite:private"
+                ],
+                "outboundTag": "direct",
+                "type": "field"
+            },
+            {
+                "domain": [
+                    "domain:ir",
+                    "geosite:category-ir"
+                ],
+                "outboundTag": "direct",
+                "type": "field"
+            },
+            {
+                "ip": [
+                    "geoip:ir"
+                ],
+                "outboundTag": "direct",
+                "type": "field"
+            },
+            {
+                "inboundTag": [
+                    "domestic-dns"
+                ],
+                "outboundTag": "direct",
+                "type": "field"
+            },
+            {
+                "balancerTag": "proxy-round",
+                "network": "tcp,udp",
+                "type": "field"
+            }
+        ]
+    }
+})
+
+_XRAY_PREFIX, _XRAY_SUFFIX = (
+    part.encode('utf-8')
+    for part in json.dumps(
+        {**_loads(_XRAY_TEMPLATE_JSON), "outbounds": "__OUTBOUNDS__"},
+        indent=2, ensure_ascii=False
+    ).split('"__OUTBOUNDS__"')
+)
+
+_TAGS: List[str] = []
+
+def _tag(n: int) -> str:
+    if n > len(_TAGS):
+        _TAGS.extend(f"proxy-{i}" for i in range(len(_TAGS) + 1, n + 1024))
+    return _TAGS[n - 1]
+
+_FIXED_OUTBOUNDS = (
+    {"protocol": "freedom", "settings": {"domainStrategy": "UseIP"}, "tag": "direct"},
+    {"protocol": "blackhole", "settings": {"response": {"type": "http"}}, "tag": "block"},
+    {"protocol": "dns", "settings": {"rules": [{"action": "hijack"}]}, "tag": "dns-out"}
+)
+
+_VMESS_SKELETON_JSON = json.dumps({
+    "protocol": "vmess",
+    "settings": {
+        "vnext": [
+            {
+                "address": None,
+                "port": 0,
+                "users": [
                     {
-                        "balancerTag": "proxy-round",
-                        "network": "tcp,udp",
-                        "type": "field"
+                        "id": None,
+                        "alterId": 0,
+                        "security": "auto",
+                        "level": 8
                     }
                 ]
             }
-        }
+        ]
+    },
+    "streamSettings": None
+})
 
-    def convert_vmess(self, data: Dict) -> Dict:
-        outbound = {
-            "protocol": "vmess",
-            "settings": {
-                "vnext": [
+_VLESS_SKELETON_JSON = json.dumps({
+    "protocol": "vless",
+    "settings": {
+        "vnext": [
+            {
+                "address": None,
+                "port": 0,
+                "users": [
                     {
-                        "address": data.get('add'),
-                        "port": int(data.get('port')),
-                        "users": [
-                            {
-                                "id": data.get('id'),
-                                "alterId": int(data.get('aid', 0)),
-                                "security": data.get('scy', 'auto'),
-                                "level": 8
-                            }
-                        ]
+                        "id": None,
+                        "flow": "",
+                        "encryption": "none",
+                        "level": 8
                     }
                 ]
-            },
-            "streamSettings": transport_builder.build_xray_settings(data)
+            }
+        ]
+    },
+    "streamSettings": None
+})
+
+_TROJAN_SKELETON_JSON = json.dumps({
+    "protocol": "trojan",
+    "settings": {
+        "servers": [
+            {
+                "address": None,
+                "port": 0,
+                "password": None,
+                "level": 8
+            }
+        ]
+    },
+    "streamSettings": None
+})
+
+_SS_SKELETON_JSON = json.dumps({
+    "protocol": "shadowsocks",
+    "settings": {
+        "servers": [
+            {
+                "address": None,
+                "port": 0,
+                "method": None,
+                "password": None,
+                "level": 8
+            }
+        ]
+    },
+    "streamSettings": {
+        "network": "tcp"
+    }
+})
+
+class ConfigToXray:
+    def __init__(self, input_file: str, output_file: str):
+        self.input_file = input_file
+        self.output_file = output_file
+        self.outbounds = []
+        self._dispatch = {
+            'vmess': (parser.decode_vmess, self.convert_vmess),
+            'vless': (parser.parse_vless, self.convert_vless),
+            'trojan': (parser.parse_trojan, self.convert_trojan),
+            'ss': (parser.parse_shadowsocks, self.convert_shadowsocks)
         }
+
+    @staticmethod
+    def get_xray_template() -> Dict:
+        return _loads(_XRAY_TEMPLATE_JSON)
+
+    def convert_vmess(self, data: Dict) -> Dict:
+        outbound = _loads(_VMESS_SKELETON_JSON)
+        vnext = outbound["settings"]["vnext"][0]
+        vnext["address"] = data.get('add')
+        vnext["port"] = int(data.get('port'))
+        user = vnext["users"][0]
+        user["id"] = data.get('id')
+        user["alterId"] = int(data.get('aid', 0))
+        user["security"] = data.get('scy', 'auto')
+        outbound["streamSettings"] = transport_builder.build_xray_settings(data)
         return outbound
 
     def convert_vless(self, data: Dict) -> Dict:
-        outbound = {
-            "protocol": "vless",
-            "settings": {
-                "vnext": [
-                    {
-                        "address": data['address'],
-                        "port": data['port'],
-                        "users": [
-                            {
-                                "id": data['uuid'],
-                                "flow": data.get('flow', ''),
-                                "encryption": "none",
-                                "level": 8
-                            }
-                        ]
-                    }
-                ]
-            },
-            "streamSettings": transport_builder.build_xray_settings(data)
-        }
+        outbound = _loads(_VLESS_SKELETON_JSON)
+        vnext = outbound["settings"]["vnext"][0]
+        vnext["address"] = data['address']
+        vnext["port"] = data['port']
+        user = vnext["users"][0]
+        user["id"] = data['uuid']
+        user["flow"] = data.get('flow', '')
+        outbound["streamSettings"] = transport_builder.build_xray_settings(data)
         return outbound
 
     def convert_trojan(self, data: Dict) -> Dict:
-        outbound = {
-            "protocol": "trojan",
-            "settings": {
-                "servers": [
-                    {
-                        "address": data['address'],
-                        "port": data['port'],
-                        "password": data['password'],
-                        "level": 8
-                    }
-                ]
-            },
-            "streamSettings": transport_builder.build_xray_settings(data)
-        }
+        outbound = _loads(_TROJAN_SKELETON_JSON)
+        server = outbound["settings"]["servers"][0]
+        server["address"] = data['address']
+        server["port"] = data['port']
+        server["password"] = data['password']
+        outbound["streamSettings"] = transport_builder.build_xray_settings(data)
         return outbound
 
     def convert_shadowsocks(self, data: Dict) -> Dict:
-        return {
-            "protocol": "shadowsocks",
-            "settings": {
-                "servers": [
-                    {
-                        "address": data['address'],
-                        "port": data['port'],
-                        "method": data['method'],
-                        "password": data['password'],
-                        "level": 8
-                    }
-                ]
-            },
-            "streamSettings": {
-                "network": "tcp"
-            }
-        }
+        outbound = _loads(_SS_SKELETON_JSON)
+        server = outbound["settings"]["servers"][0]
+        server["address"] = data['address']
+        server["port"] = data['port']
+        server["method"] = data['method']
+        server["password"] = data['password']
+        return outbound
+
+    def _process_line(self, line: str) -> Optional[Dict]:
+        sep = line.find('://', 2, 12)
+        if sep == -1:
+            return None
+
+        scheme = line[:sep]
+        entry = self._dispatch.get(scheme) or self._dispatch.get(scheme.lower())
+        if not entry:
+            return None
+
+        parse_func, convert_func = entry
+        try:
+            data = parse_func(line)
+            if data:
+                return convert_func(data)
+        except Exception as e:
+            logger.warning(f"Failed to parse config {line[:30]}...: {e}")
+        return None
 
     def process_configs(self):
+        lines = []
+        seen = set()
+
         try:
             with open(self.input_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+                for raw in f:
+                    line = raw.strip()
+                    if not line or line.startswith('//') or line in seen:
+                        continue
+                    seen.add(line)
+                    lines.append(line)
         except FileNotFoundError:
             logger.error(f"{self.input_file} not found!")
             return
@@ -251,58 +352,32 @@ class ConfigToXray:
             logger.error(f"Error reading {self.input_file}: {e}")
             return
 
-        final_config = self.get_xray_template()
-        temp_outbounds = []
-        
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith('//'):
-                continue
-            
-            line_lower = line.lower()
-            outbound = None
-            data = None
+        if len(lines) >= _PARALLEL_MIN_LINES and (os.cpu_count() or 1) > 1:
+            with ProcessPoolExecutor() as executor:
+                results = executor.map(self._process_line, lines, chunksize=_PARALLEL_CHUNKSIZE)
+                temp_outbounds = [outbound for outbound in results if outbound]
+        else:
+            temp_outbounds = [outbound for outbound in map(self._process_line, lines) if outbound]
 
-            try:
-                if line_lower.startswith('vmess://'):
-                    data = parser.decode_vmess(line)
-                    if data:
-                        outbound = self.convert_vmess(data)
-                elif line_lower.startswith('vless://'):
-                    data = parser.parse_vless(line)
-                    if data:
-                        outbound = self.convert_vless(data)
-                elif line_lower.startswith('trojan://'):
-                    data = parser.parse_trojan(line)
-                    if data:
-                        outbound = self.convert_trojan(data)
-                elif line_lower.startswith('ss://'):
-                    data = parser.parse_shadowsocks(line)
-                    if data:
-                        outbound = self.convert_shadowsocks(data)
-            except Exception as e:
-                logger.warning(f"Failed to parse config {line[:30]}...: {e}")
+        for index, outbound in enumerate(temp_outbounds, 1):
+            outbound["tag"] = _tag(index)
 
-            if outbound:
-                outbound["tag"] = f"proxy-{len(temp_outbounds) + 1}"
-                temp_outbounds.append(outbound)
-        
         if not temp_outbounds:
             logger.error("No valid configs found to convert.")
             return
 
-        temp_outbounds.extend([
-            {"protocol": "freedom", "settings": {"domainStrategy": "UseIP"}, "tag": "direct"},
-            {"protocol": "blackhole", "settings": {"response": {"type": "http"}}, "tag": "block"},
-            {"protocol": "dns", "settings": {"rules": [{"action": "hijack"}]}, "tag": "dns-out"}
-        ])
-        
-        final_config["outbounds"] = temp_outbounds
+        temp_outbounds.extend(_FIXED_OUTBOUNDS)
         
         try:
             os.makedirs(os.path.dirname(self.output_file) or '.', exist_ok=True)
-            with open(self.output_file, 'w', encoding='utf-8') as f:
-                json.dump(final_config, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                body = orjson.dumps(temp_outbounds, option=orjson.OPT_INDENT_2)
+            else:
+                body = json.dumps(temp_outbounds, indent=2, ensure_ascii=False).encode('utf-8')
+            with open(self.output_file, 'wb') as f:
+                f.write(_XRAY_PREFIX)
+                f.write(body.replace(b'\n', b'\n  '))
+                f.write(_XRAY_SUFFIX)
             logger.info(f"Successfully converted {len(temp_outbounds) - 3} configs to {self.output_file}")
         except Exception as e:
             logger.error(f"Failed to write output file: {e}")